@@ -0,0 +1,40 @@
+"""
+Google Sheets auth shared by dump_sheets.py, explore_sheets.py and import_preview.py.
+"""
+
+import os
+from google.oauth2.credentials import Credentials
+from google_auth_oauthlib.flow import InstalledAppFlow
+from google.auth.transport.requests import Request, AuthorizedSession
+from googleapiclient.discovery import build
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+READONLY_SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
+CREDS_FILE = os.path.join(_HERE, "credentials.json")
+TOKEN_FILE = os.path.join(_HERE, "token.json")
+
+
+def get_credentials(scopes=READONLY_SCOPES):
+    creds = None
+    if os.path.exists(TOKEN_FILE):
+        creds = Credentials.from_authorized_user_file(TOKEN_FILE, scopes)
+    if not creds or not creds.valid:
+        if creds and creds.expired and creds.refresh_token:
+            creds.refresh(Request())
+        else:
+            flow = InstalledAppFlow.from_client_secrets_file(CREDS_FILE, scopes)
+            creds = flow.run_local_server(port=0)
+        with open(TOKEN_FILE, "w") as f:
+            f.write(creds.to_json())
+    return creds
+
+
+def get_service(scopes=READONLY_SCOPES):
+    # Use the discovery doc bundled with googleapiclient rather than fetching it
+    return build("sheets", "v4", credentials=get_credentials(scopes),
+                 static_discovery=True, cache_discovery=False)
+
+
+def get_session(scopes=READONLY_SCOPES):
+    """Return a requests session that reuses one keep-alive connection for REST calls."""
+    return AuthorizedSession(get_credentials(scopes))
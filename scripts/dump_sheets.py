@@ -1,50 +1,99 @@
 """
-Dump all YYYY-MM sheets as JSON files for analysis.
+Dump all YYYY-MM sheets as gzipped JSON files (sheet_<title>.json.gz) for analysis.
+
+Usage:
+    python3 dump_sheets.py [SHEET ...]
+
+With no arguments every date sheet is dumped. Name one or more sheets
+(e.g. 2026-02) to re-fetch only those and leave the other JSON files as-is.
 """
-import os, json, re
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+import os, sys, json, re, gzip, hashlib
+from _sheets_client import get_session
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib encoder
+    orjson = None
 
+try:
+    import ijson
+except ImportError:  # parse the whole batchGet response at once instead
+    ijson = None
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
 SPREADSHEET_ID = "1BpjoT3mXofJem4JMQtbbi3c8O35ftRAQ4ley2zSgcEQ"
-SCOPES = ["https://www.googleapis.com/auth/spreadsheets.readonly"]
-CREDS_FILE = os.path.join(os.path.dirname(__file__), "credentials.json")
-TOKEN_FILE = os.path.join(os.path.dirname(__file__), "token.json")
-
-def get_service():
-    creds = None
-    if os.path.exists(TOKEN_FILE):
-        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
+SHEETS_URL = f"https://sheets.googleapis.com/v4/spreadsheets/{SPREADSHEET_ID}"
+_DATE_SHEET_RE = re.compile(r"^\d{4}-\d{2}(-\d{2})?$")
+
+def write_json(rows, path):
+    """Write rows to path unless the content is unchanged. Returns True if written."""
+    if orjson is not None:
+        data = orjson.dumps(rows)
+    else:
+        # Match orjson's compact UTF-8 output so the .sha check agrees either way
+        data = json.dumps(rows, separators=(",", ":"), ensure_ascii=False).encode()
+    # gzip output embeds a timestamp, so compare a hash of the JSON itself
+    digest = hashlib.blake2b(data, digest_size=16).hexdigest()
+    hash_path = path + ".sha"
+    if os.path.exists(path) and os.path.exists(hash_path):
+        with open(hash_path) as f:
+            if f.read().strip() == digest:
+                return False
+    # Level 1 gets most of the size reduction on sparse sheet data for little CPU.
+    # Write to a temp file and swap it in so an interrupted run never leaves
+    # a truncated dump behind.
+    tmp = path + ".tmp"
+    with gzip.open(tmp, "wb", compresslevel=1) as f:
+        f.write(data)
+    os.replace(tmp, path)
+    with open(hash_path, "w") as f:
+        f.write(digest)
+    return True
+
+def main(only=None):
+    # Both requests below go over the same keep-alive connection
+    session = get_session()
+    resp = session.get(SHEETS_URL, params={"fields": "sheets.properties.title"})
+    resp.raise_for_status()
+    meta = resp.json()
+
+    titles = [s["properties"]["title"] for s in meta["sheets"]
+              if _DATE_SHEET_RE.match(s["properties"]["title"].strip())]
+    if only:
+        # Sheets exposes no per-tab revision, so skipping unchanged tabs is opt-in
+        titles = [t for t in titles if t in only]
+        missing = sorted(only.difference(titles))
+        if missing:
+            # Most likely a typo; fail rather than exit 0 having dumped nothing
+            for name in missing:
+                print(f"No date sheet named {name!r}", file=sys.stderr)
+            sys.exit(1)
+    if not titles:
+        return
+
+    # One batchGet for all date sheets instead of a round-trip per sheet.
+    # Keep FORMATTED_VALUE: import_preview.py parsers expect every cell as a
+    # string and read dates as "M/D" text, not serial numbers.
+    resp = session.get(f"{SHEETS_URL}/values:batchGet", params={
+        "ranges": [f"'{t}'" for t in titles],
+        "majorDimension": "ROWS",
+        "valueRenderOption": "FORMATTED_VALUE",
+    }, stream=True)
+    resp.raise_for_status()
+    if ijson is not None:
+        # Decode one sheet's valueRange at a time rather than the whole body
+        resp.raw.decode_content = True
+        value_ranges = ijson.items(resp.raw, "valueRanges.item", use_float=True)
+    else:
+        value_ranges = resp.json().get("valueRanges", [])
+
+    for title, value_range in zip(titles, value_ranges):
+        rows = value_range.get("values", [])
+        out = os.path.join(_HERE, f"sheet_{title}.json.gz")
+        if write_json(rows, out):
+            print(f"Saved {title}: {len(rows)} rows -> {out}")
         else:
-            flow = InstalledAppFlow.from_client_secrets_file(CREDS_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open(TOKEN_FILE, "w") as f:
-            f.write(creds.to_json())
-    return build("sheets", "v4", credentials=creds)
-
-def main():
-    service = get_service()
-    ss = service.spreadsheets()
-    meta = ss.get(spreadsheetId=SPREADSHEET_ID).execute()
-
-    for sheet in meta["sheets"]:
-        title = sheet["properties"]["title"]
-        if not re.match(r"^\d{4}-\d{2}(-\d{2})?$", title.strip()):
-            continue
-        result = ss.values().get(
-            spreadsheetId=SPREADSHEET_ID,
-            range=f"'{title}'",
-            valueRenderOption="FORMATTED_VALUE"
-        ).execute()
-        rows = result.get("values", [])
-        out = os.path.join(os.path.dirname(__file__), f"sheet_{title}.json")
-        with open(out, "w") as f:
-            json.dump(rows, f, indent=2)
-        print(f"Saved {title}: {len(rows)} rows -> {out}")
+            print(f"Unchanged {title}: {len(rows)} rows, kept {out}")
 
 if __name__ == "__main__":
-    main()
+    main(set(sys.argv[1:]))
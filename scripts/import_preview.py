@@ -6,15 +6,24 @@ Columns: date | lift_id | lift_name | sets | reps | weight | notes | flag | sour
 Run this first to review before importing to Firestore.
 """
 
-import os, re, json, csv
+import os, re, json, csv, gzip, bisect, functools, unicodedata, difflib
+from operator import attrgetter
 from datetime import date, timedelta
+from concurrent.futures import ThreadPoolExecutor
+
+try:
+    import orjson
+except ImportError:  # fall back to the stdlib parser
+    orjson = None
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
 
 # ---------------------------------------------------------------------------
 # Strava ground-truth dates
 # ---------------------------------------------------------------------------
 
 STRAVA_JSON = os.path.normpath(
-    os.path.join(os.path.dirname(__file__), "..", "..", "strava-bodycomp", "strava_activities.json")
+    os.path.join(_HERE, "..", "..", "strava-bodycomp", "strava_activities.json")
 )
 _STRAVA_STRENGTH_TYPES = {"WeightTraining", "Crossfit"}
 
@@ -23,8 +32,8 @@ def load_strava_dates():
     """Return set of dates with WeightTraining/Crossfit Strava activities."""
     if not os.path.exists(STRAVA_JSON):
         return set()
-    with open(STRAVA_JSON) as f:
-        data = json.load(f)
+    with open(STRAVA_JSON, "rb") as f:
+        data = orjson.loads(f.read()) if orjson is not None else json.load(f)
     return {
         date.fromisoformat(a["start_date_local"][:10])
         for a in data.get("activities", [])
@@ -32,56 +41,51 @@ def load_strava_dates():
     }
 
 
-def snap_to_strava(d, strava_dates, tol=4):
-    """Return nearest Strava date within tol days (prefer forward), or d unchanged."""
-    if not strava_dates or d in strava_dates:
-        return d
-    for delta in range(1, tol + 1):
-        if d + timedelta(days=delta) in strava_dates:
-            return d + timedelta(days=delta)
-        if d - timedelta(days=delta) in strava_dates:
-            return d - timedelta(days=delta)
-    return d
+def build_snap_table(strava_dates, tol=4):
+    """
+    Map every date within tol days of a Strava date to the nearest Strava date
+    (prefer forward). Dates not in the table are left unchanged when snapping.
+    """
+    table = {}
+    # Visit offsets in preference order: exact, +1, -1, +2, -2, ...
+    for delta in [0] + [k for i in range(1, tol + 1) for k in (i, -i)]:
+        for s in strava_dates:
+            table.setdefault(s - timedelta(days=delta), s)
+    return table
 
 
-# Module-level Strava dates (set by main() before parsing)
-_strava_dates: set = set()
+# Module-level Strava workout dates in ascending order (set by get_entries()
+# before parsing), so range lookups can bisect
+_strava_sorted: list = []
 
 
 def _strava_window(start, end):
     """Return sorted list of Strava workout dates in [start, end)."""
-    return sorted(d for d in _strava_dates if start <= d < end)
+    lo = bisect.bisect_left(_strava_sorted, start)
+    hi = bisect.bisect_left(_strava_sorted, end, lo)
+    return _strava_sorted[lo:hi]
+
 
+def _strava_after(d):
+    """First Strava workout date after d, or None."""
+    i = bisect.bisect_right(_strava_sorted, d)
+    return _strava_sorted[i] if i < len(_strava_sorted) else None
 
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from google.auth.transport.requests import Request
-from googleapiclient.discovery import build
+
+def _strava_before(d):
+    """Last Strava workout date before d, or None."""
+    i = bisect.bisect_left(_strava_sorted, d)
+    return _strava_sorted[i - 1] if i else None
+
+
+from _sheets_client import get_service
 
 SPREADSHEET_ID = "1BpjoT3mXofJem4JMQtbbi3c8O35ftRAQ4ley2zSgcEQ"
 SCOPES = ["https://www.googleapis.com/auth/spreadsheets"]
-CREDS_FILE = os.path.join(os.path.dirname(__file__), "credentials.json")
-TOKEN_FILE  = os.path.join(os.path.dirname(__file__), "token.json")
 PREVIEW_SHEET_NAME = "import-preview"
 
-
-# ---------------------------------------------------------------------------
-# Auth
-# ---------------------------------------------------------------------------
-
-def get_service():
-    creds = None
-    if os.path.exists(TOKEN_FILE):
-        creds = Credentials.from_authorized_user_file(TOKEN_FILE, SCOPES)
-    if not creds or not creds.valid:
-        if creds and creds.expired and creds.refresh_token:
-            creds.refresh(Request())
-        else:
-            flow = InstalledAppFlow.from_client_secrets_file(CREDS_FILE, SCOPES)
-            creds = flow.run_local_server(port=0)
-        with open(TOKEN_FILE, "w") as f:
-            f.write(creds.to_json())
-    return build("sheets", "v4", credentials=creds)
+# entries.csv columns; write_firestore.py reads the file back by these names
+CSV_COLUMNS = ("date", "lift_id", "lift_name", "sets", "reps", "weight", "notes", "flag", "source")
 
 
 # ---------------------------------------------------------------------------
@@ -251,22 +255,92 @@ HISTORICAL_LIFT_NAMES = {
     "straight_arm_pulldown": "Straight Arm Pulldown",
 }
 
+# Both tables in one, current names winning, for single-lookup display names
+LIFT_NAMES = {**HISTORICAL_LIFT_NAMES, **CURRENT_LIFT_NAMES}
+
+
+_RE_DASH_SUFFIX = re.compile(r"\s+[–—]\s+.*$")
+
+
+def _lift_key(name: str) -> str:
+    """Normalize a lift name for lookup: lowercase, accents dropped, letters/digits only."""
+    s = unicodedata.normalize("NFKD", name.lower())
+    return "".join(ch for ch in s if ch.isalnum())
+
+
+# LIFT_MAP keyed by normalized name, so spacing/punctuation variants of an
+# alias ("pull ups", "Pull-Ups", "farmers carries") resolve with one lookup.
+_LIFT_INDEX = {_lift_key(k): v for k, v in LIFT_MAP.items()}
+_LIFT_KEYS = tuple(_LIFT_INDEX)
+
+
+# (label, lift_id) → rows resolved by spelling match; get_entries() reports them
+_fuzzy_matches: dict = {}
+
 
 def resolve_lift(name: str):
     """Return (lift_id, display_name) or (None, None)."""
+    lift_id, display, fuzzy = _match_lift(name)
+    if fuzzy:
+        hit = (name.strip(), lift_id)
+        _fuzzy_matches[hit] = _fuzzy_matches.get(hit, 0) + 1
+    return lift_id, display
+
+
+@functools.lru_cache(maxsize=None)
+def _match_lift(name: str):
+    """Return (lift_id, display_name, fuzzy) or (None, None, False)."""
     key = name.strip().lower()
-    key = re.sub(r"\s+[–—]\s+.*$", "", key).strip()
-    lift_id = LIFT_MAP.get(key)
+    if "–" in key or "—" in key:  # e.g. "back squat – heavy"
+        key = _RE_DASH_SUFFIX.sub("", key).strip()
+    norm = _lift_key(key)
+    lift_id = _LIFT_INDEX.get(norm)
+    fuzzy = False
+    if lift_id is None and norm:
+        # Fall back to a close spelling match (typos like "benchpres"); the
+        # high cutoff keeps unrelated labels from being pulled in.
+        close = difflib.get_close_matches(norm, _LIFT_KEYS, n=1, cutoff=0.9)
+        if close:
+            lift_id = _LIFT_INDEX[close[0]]
+            fuzzy = True
     if lift_id is None:
-        return None, None
-    display = CURRENT_LIFT_NAMES.get(lift_id) or HISTORICAL_LIFT_NAMES.get(lift_id) or lift_id
-    return lift_id, display
+        return None, None, False
+    display = LIFT_NAMES.get(lift_id) or lift_id
+    return lift_id, display, fuzzy
 
 
 # ---------------------------------------------------------------------------
 # Parsing helpers
 # ---------------------------------------------------------------------------
 
+# Patterns used by the cell parsers below, compiled once at import
+_RE_NXM_STRIP     = re.compile(r"\d+\s*[xX×]\s*\d+(?:\s*[-–]\s*\d+)?")
+_RE_UNIT          = re.compile(r"\s*(lb|lbs|#|kg)\b")
+_RE_NUMBER        = re.compile(r"\d+(?:\.\d+)?")
+_RE_DIGITS        = re.compile(r"\d+")
+_RE_SIDE          = re.compile(r"/side", re.I)
+_RE_SCHEME_SPEC   = re.compile(r"(\d+)(?:\s*[-–]\s*(\d+))?\s*[xX×]\s*(\d+)(?:\s*[-–]\s*(\d+))?")
+_RE_DBS           = re.compile(r"(\d+)s(?=\W|$)")
+_RE_QMARK         = re.compile(r"(\d+)\?(?=\s|$)")
+_RE_NOPE          = re.compile(r"\bnope[:\s]+(\S.*)", re.I)
+_RE_NOPE_WEIGHT   = re.compile(r"(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?\s+\d+[xX×]")
+_RE_SLASH         = re.compile(r"^(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?\s+((?:\d+/)+\d+)")
+_RE_FULL          = re.compile(r"(\d+)\s*[xX×]\s*(\d+)(?:\s*@\s*|\s+)(\d+(?:\.\d+)?)")
+_RE_WFIRST        = re.compile(r"(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s+\w+)?\s+(\d+)[xX×](\d+)")
+_RE_SCHEME        = re.compile(r"(\d+)[xX×](\d+)")
+_RE_WEIGHT_BEFORE = re.compile(r"(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s+\w+)?\s*$")
+_RE_WEIGHT_AFTER  = re.compile(r"\b(\d+(?:\.\d+)?)\b")
+_RE_XI            = re.compile(r"^([xi]+)", re.I)
+_RE_RM            = re.compile(r"(\d+)\s*rm(?:\s+test)?[:\s,]+(\d+)", re.I)
+_RE_LONE          = re.compile(r"^(\d+(?:\.\d+)?)\s*(?:lb|lbs|#)?(?:[\s,.]|$)")
+_RE_MULTI_GROUP   = re.compile(
+    r"(?:(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s+\w+)?\s*)?"
+    r"(\d+)[xX×](\d+)"
+)
+_RE_WEIGHT_POST   = re.compile(r"\s*(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s|,|$)")  # use .match
+
+
+@functools.lru_cache(maxsize=None)
 def parse_weight(s: str):
     """Return float weight, 0.0 for bodyweight/band, None if can't determine."""
     s = _preprocess_db_notation(s.strip())
@@ -284,13 +358,13 @@ def parse_weight(s: str):
 
     # Strip any NxM (or NxM-M) patterns — they're sets/reps, not weights.
     # Then find the remaining numeric value, which is the actual weight.
-    s_no_scheme = re.sub(r"\d+\s*[xX×]\s*\d+(?:\s*[-–]\s*\d+)?", "", s).strip()
+    s_no_scheme = _RE_NXM_STRIP.sub("", s).strip()
     s_to_search = s_no_scheme if s_no_scheme.strip() else None
     if s_to_search is None:
         return None  # only had NxM, no separate weight
 
-    s2 = re.sub(r"\s*(lb|lbs|#|kg)\b", " ", s_to_search).strip()
-    nums = [float(n) for n in re.findall(r"\d+(?:\.\d+)?", s2)]
+    s2 = _RE_UNIT.sub(" ", s_to_search).strip()
+    nums = [float(n) for n in _RE_NUMBER.findall(s2)]
     if nums:
         # Prefer the largest plausible weight
         plausible = [n for n in nums if 0 < n <= 800]
@@ -300,41 +374,44 @@ def parse_weight(s: str):
     return 0.0
 
 
+@functools.lru_cache(maxsize=None)
 def parse_sets_reps_scheme(scheme: str):
     """Parse '5x5', '4x5-6', '3x8-10', '2x10/side', etc. Returns (sets, reps) maxes."""
     if not scheme:
         return None, None
-    scheme = re.sub(r"/side", "", scheme, flags=re.I)
-    m = re.match(
-        r"(\d+)(?:\s*[-–]\s*(\d+))?\s*[xX×]\s*(\d+)(?:\s*[-–]\s*(\d+))?",
-        scheme.strip()
-    )
+    scheme = _RE_SIDE.sub("", scheme)
+    m = _RE_SCHEME_SPEC.match(scheme.strip())
     if not m:
         return None, None
     return int(m.group(2) or m.group(1)), int(m.group(4) or m.group(3))
 
 
+@functools.lru_cache(maxsize=None)
 def _preprocess_db_notation(s: str) -> str:
     """Convert 'Ns' per-hand dumbbell notation to just 'N' (e.g., '50s 3x10' → '50 3x10').
     Also strip uncertain '?' after a number (e.g., '215? 5x5' → '215 5x5').
     Lookahead uses \\W so '20s.' (period after s) is also caught."""
-    s = re.sub(r"(\d+)s(?=\W|$)", r"\1", s)
-    s = re.sub(r"(\d+)\?(?=\s|$)", r"\1", s)
+    if "s" not in s and "?" not in s:
+        return s  # neither pattern can match
+    s = _RE_DBS.sub(r"\1", s)
+    s = _RE_QMARK.sub(r"\1", s)
     return s
 
 
+_QUOTES = frozenset(('"', '\u201c', '\u201d'))
+_DITTO_SET = _QUOTES | {'\u2019'}
+
+
 def is_ditto(cell: str) -> bool:
     """True if cell is a lone ditto/quote mark meaning 'same as before'."""
-    c = cell.strip()
-    return c in ('"', '\u201c', '\u201d', '\u2019')
+    return cell.strip() in _DITTO_SET
 
 
 def ditto_suffix(cell: str):
     """If cell starts with a ditto mark and has extra text, return the suffix."""
     c = cell.strip()
-    for quote in ('"', '\u201c', '\u201d'):
-        if c.startswith(quote) and len(c) > 1:
-            return c[1:].strip()
+    if len(c) > 1 and c[0] in _QUOTES:
+        return c[1:].strip()
     return None
 
 
@@ -354,12 +431,20 @@ def extract_performance(notes: str, planned_sets, planned_reps, planned_weight):
     r = planned_reps
     w = planned_weight
 
+    # Each pattern below needs a literal ("nope", "/", an x, "rm") to match;
+    # test for it with a substring check first so prose notes skip the regexes.
+    # All of them except xxxxx/iiiii also need a digit, so one scan for a
+    # digit rules the rest out for plain-text notes.
+    nl = notes.lower()
+    has_digit = _RE_DIGITS.search(notes) is not None
+    has_x = has_digit and ("x" in nl or "×" in notes)
+
     # "nope: R1R2R3" or "W NxM nope N1 N2 N3" — actual per-set rep counts
     # Digits concatenated like "776" → [7,7,6]; space-separated "15 15 13" → [15,15,13].
-    nope_m = re.search(r"\bnope[:\s]+(\S.*)", notes, re.I)
+    nope_m = _RE_NOPE.search(notes) if has_digit and "nope" in nl else None
     if nope_m:
         after_nope = nope_m.group(1)
-        raw_reps = re.findall(r"\d+", after_nope)
+        raw_reps = _RE_DIGITS.findall(after_nope)
         expanded = []
         for rn in raw_reps:
             val = int(rn)
@@ -373,12 +458,12 @@ def extract_performance(notes: str, planned_sets, planned_reps, planned_weight):
             min_reps = min(expanded)
             before_nope = notes[:nope_m.start()].strip()
             # Extract weight from before "nope" (pattern: W NxM)
-            wm = re.search(r"(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?\s+\d+[xX×]", before_nope)
+            wm = _RE_NOPE_WEIGHT.search(before_nope)
             nw = float(wm.group(1)) if wm and float(wm.group(1)) >= 10 else (w or 0.0)
             return n_sets, min_reps, nw, notes
 
     # "W# N/N/M" — weight then slash-separated per-set rep counts (e.g. "25# 4/4/2")
-    slash_m = re.match(r"^(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?\s+((?:\d+/)+\d+)", notes)
+    slash_m = _RE_SLASH.match(notes) if has_digit and "/" in notes else None
     if slash_m:
         nw = float(slash_m.group(1))
         rep_counts = [int(x) for x in slash_m.group(2).split("/")]
@@ -386,7 +471,7 @@ def extract_performance(notes: str, planned_sets, planned_reps, planned_weight):
             return len(rep_counts), min(rep_counts), nw, notes
 
     # "N×M @W" or "N×M W" — full match
-    full = re.search(r"(\d+)\s*[xX×]\s*(\d+)(?:\s*@\s*|\s+)(\d+(?:\.\d+)?)", notes)
+    full = _RE_FULL.search(notes) if has_x else None
     if full:
         ns, nr, nw = int(full.group(1)), int(full.group(2)), float(full.group(3))
         # Sanity: if "reps" looks like a weight (>50), it's probably "N reps @ W lbs"
@@ -395,14 +480,14 @@ def extract_performance(notes: str, planned_sets, planned_reps, planned_weight):
         return ns, nr, nw, notes
 
     # "W N×M" — weight first (e.g. "135 3x5" or "50# dbs 3x15")
-    wfirst = re.search(r"(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s+\w+)?\s+(\d+)[xX×](\d+)", notes)
+    wfirst = _RE_WFIRST.search(notes) if has_x else None
     if wfirst:
         nw, ns, nr = float(wfirst.group(1)), int(wfirst.group(2)), int(wfirst.group(3))
         if ns <= 15 and nr <= 40 and nw > ns and nw > nr:  # plausibility check
             return ns, nr, nw, notes
 
     # "N×M" alone — look for a weight before or after it
-    scheme = re.search(r"(\d+)[xX×](\d+)", notes)
+    scheme = _RE_SCHEME.search(notes) if has_x else None
     if scheme:
         ns, nr = int(scheme.group(1)), int(scheme.group(2))
         # If reps > 50, this is likely "N reps @ W" — treat second as weight
@@ -410,31 +495,31 @@ def extract_performance(notes: str, planned_sets, planned_reps, planned_weight):
             return 1, ns, float(nr), notes
         # Look for weight in the text before the match
         before = notes[:scheme.start()]
-        wm_before = re.search(r"(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s+\w+)?\s*$", before)
+        wm_before = _RE_WEIGHT_BEFORE.search(before)
         if wm_before:
             nw = float(wm_before.group(1))
             if nw > 20:
                 return ns, nr, nw, notes
         # Look for weight after the match
         after = notes[scheme.end():]
-        wm_after = re.search(r"\b(\d+(?:\.\d+)?)\b", after)
+        wm_after = _RE_WEIGHT_AFTER.search(after)
         nw = float(wm_after.group(1)) if wm_after and float(wm_after.group(1)) > 20 else (w or 0.0)
         return ns, nr, nw, notes
 
     # "xxxxx" / "iiiii" — x or i count = sets done at plan
-    xi = re.match(r"^([xi]+)", notes, re.I)
+    xi = _RE_XI.match(notes)
     if xi:
         n_sets = len(xi.group(1))
         return n_sets, (r or 0), (w or 0.0), notes
 
     # "Nrm test: W" or "build to Nrm" patterns
-    rm_test = re.search(r"(\d+)\s*rm(?:\s+test)?[:\s,]+(\d+)", notes, re.I)
+    rm_test = _RE_RM.search(notes) if has_digit and "rm" in nl else None
     if rm_test:
         return 1, int(rm_test.group(1)), float(rm_test.group(2)), notes
 
     # Lone number that plausibly is a weight (cap at 1000 to avoid tracking codes)
     # Allow period/comma after number so "20. foot out chest..." is caught.
-    lone = re.match(r"^(\d+(?:\.\d+)?)\s*(?:lb|lbs|#)?(?:[\s,.]|$)", notes)
+    lone = _RE_LONE.match(notes) if has_digit else None
     if lone:
         candidate = float(lone.group(1))
         if 10 <= candidate <= 1000:
@@ -453,11 +538,7 @@ def _parse_multi_group(cell: str, planned_sets, planned_reps):
     than a rep count (e.g. '3x275' = 3 reps at 275 lbs, not 3 sets x 275 reps).
     """
     cell = _preprocess_db_notation(cell)  # "50s" → "50"
-    pattern = re.compile(
-        r"(?:(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s+\w+)?\s*)?"
-        r"(\d+)[xX×](\d+)"
-    )
-    matches = list(pattern.finditer(cell))
+    matches = list(_RE_MULTI_GROUP.finditer(cell))
     if len(matches) < 1:
         return []
     last_end = matches[-1].end()
@@ -469,8 +550,9 @@ def _parse_multi_group(cell: str, planned_sets, planned_reps):
         # If no prefix weight, check immediately after this match for "NxM W" format
         if prefix_w == 0 and b <= 50:
             seg_end = matches[mi + 1].start() if mi + 1 < len(matches) else len(cell)
-            after_seg = cell[m.end():seg_end]
-            wm_post = re.search(r"^\s*(\d+(?:\.\d+)?)\s*(?:lb|lbs|#|kg)?(?:\s|,|$)", after_seg)
+            # Match in place between this group and the next; endpos makes
+            # "$" hold at seg_end just as it did on a sliced copy.
+            wm_post = _RE_WEIGHT_POST.match(cell, m.end(), seg_end)
             if wm_post:
                 candidate = float(wm_post.group(1))
                 if candidate > max(a, b):  # must be plausibly a weight, not a rep count
@@ -487,12 +569,22 @@ def _parse_multi_group(cell: str, planned_sets, planned_reps):
 # Date helpers
 # ---------------------------------------------------------------------------
 
+# "start M/D" style session headers and date-only cells in the parsers below
+_RE_MD          = re.compile(r"(\d{1,2}/\d{1,2})")
+_RE_MD_ANCHORED = re.compile(r"^\d{1,2}/\d{1,2}$")
+_RE_MD_DASH     = re.compile(r"(\d{1,2})[/\-](\d{1,2})(?:[/\-]\d{2,4})?")
+
+
 def parse_month_day(s: str, year_hint: int, prev_month: int = None):
     s = s.strip()
-    m = re.match(r"^(\d{1,2})[/\-](\d{1,2})$", s)
-    if not m:
+    # "M/D" or "MM-DD": at most 5 chars, separator at index 1 or 2
+    if not 3 <= len(s) <= 5:
+        return None
+    sep = 1 if s[1] in "/-" else 2
+    ms, ds = s[:sep], s[sep + 1:]
+    if s[sep] not in "/-" or len(ds) > 2 or not (ms.isdecimal() and ds.isdecimal()):
         return None
-    month, day = int(m.group(1)), int(m.group(2))
+    month, day = int(ms), int(ds)
     year = year_hint
     if prev_month and month < prev_month and prev_month >= 10:
         year += 1
@@ -502,20 +594,50 @@ def parse_month_day(s: str, year_hint: int, prev_month: int = None):
         return None
 
 
+def _first_month_day(row, cols, year_hint: int, prev_month: int = None):
+    """Return the date from the first of row[cols] that parses as M/D, or None."""
+    for ci in cols:
+        if ci < len(row):
+            d = parse_month_day(row[ci], year_hint, prev_month)
+            if d:
+                return d
+    return None
+
+
+def _numbered_rows(rows):
+    """[(ri, row, week, day)] for data rows whose first two cells are integers."""
+    out = []
+    for ri, row in enumerate(rows[1:], start=1):
+        if len(row) >= 2:
+            ws, ds = row[0].strip(), row[1].strip()
+            if ws.isdigit() and ds.isdigit():
+                out.append((ri, row, int(ws), int(ds)))
+    return out
+
+
+def _pad_rows(rows, width):
+    """Strip every cell and pad short rows with "" so columns < width index directly."""
+    return [[c.strip() for c in r] + [""] * (width - len(r)) for r in rows]
+
+
 def sheet_year(sheet_name: str):
-    m = re.match(r"(\d{4})-(\d{2})", sheet_name)
-    return (int(m.group(1)), int(m.group(2))) if m else (2025, 1)
+    ys, sep, ms = sheet_name[:4], sheet_name[4:5], sheet_name[5:7]
+    if sep == "-" and len(ms) == 2 and ys.isdecimal() and ms.isdecimal():
+        return int(ys), int(ms)
+    return 2025, 1
 
 
 # ---------------------------------------------------------------------------
 # Entry
 # ---------------------------------------------------------------------------
 
+# Explicit __slots__ rather than @dataclass(slots=True), which needs Python
+# 3.10+. Mutable: snapping and the manual corrections rewrite entries in place.
 class Entry:
     __slots__ = ("dt","lift_id","lift_name","sets","reps","weight","notes",
-                 "source","raw","flag")
+                 "source","raw","flag","flag_types")
     def __init__(self, dt, lift_id, lift_name, sets, reps, weight,
-                 notes, source, raw, flag=""):
+                 notes, source, raw, flag="", flag_types=frozenset()):
         self.dt = dt
         self.lift_id = lift_id
         self.lift_name = lift_name
@@ -526,6 +648,7 @@ class Entry:
         self.source = source
         self.raw = raw
         self.flag = flag
+        self.flag_types = flag_types  # the "type" part of each flag reason
 
 
 # ---------------------------------------------------------------------------
@@ -535,12 +658,13 @@ class Entry:
 def _fill_missing_dates(session_dates, all_sessions, default_interval):
     if not all_sessions:
         return
-    known = [(k, v) for k, v in session_dates.items() if k in all_sessions]
+    pos = {k: i for i, k in enumerate(all_sessions)}
+    known = [(k, v) for k, v in session_dates.items() if k in pos]
     if not known:
         return
     known.sort()
     earliest_k, _ = known[0]
-    idx = all_sessions.index(earliest_k)
+    idx = pos[earliest_k]
     for i in range(idx - 1, -1, -1):
         k = all_sessions[i]
         if k not in session_dates:
@@ -557,29 +681,21 @@ def _fill_missing_dates(session_dates, all_sessions, default_interval):
 
 def parse_2025_03(rows, sheet_name):
     entries = []
+    rows = _pad_rows(rows, 11)
     year, _ = sheet_year(sheet_name)
     session_dates = {}
     row_dates = {}   # row_idx → date for rows with an explicit date annotation
     last_month = 3
 
-    for ri, row in enumerate(rows[1:], start=1):
-        if len(row) < 2 or not row[0].strip().isdigit() or not row[1].strip().isdigit():
-            continue
-        week, day = int(row[0]), int(row[1])
-        for ci in [9, 10]:
-            if len(row) > ci and row[ci].strip():
-                d = parse_month_day(row[ci].strip(), year, last_month)
-                if d:
-                    row_dates[ri] = d                          # per-row date
-                    session_dates.setdefault((week, day), d)   # anchor for block
-                    last_month = d.month
-                    break  # use first date col that has a value
-
-    all_sessions = sorted({
-        (int(r[0]), int(r[1]))
-        for r in rows[1:]
-        if len(r) >= 2 and r[0].strip().isdigit() and r[1].strip().isdigit()
-    })
+    numbered = _numbered_rows(rows)
+    for ri, row, week, day in numbered:
+        d = _first_month_day(row, (9, 10), year, last_month)  # first date col with a value
+        if d:
+            row_dates[ri] = d                          # per-row date
+            session_dates.setdefault((week, day), d)   # anchor for block
+            last_month = d.month
+
+    all_sessions = sorted({(week, day) for _, _, week, day in numbered})
 
     # Compute median inter-session interval from actual dated sessions
     if len(session_dates) >= 2:
@@ -594,26 +710,26 @@ def parse_2025_03(rows, sheet_name):
         median_interval = timedelta(days=4)
     _fill_missing_dates(session_dates, all_sessions, median_interval)
 
-    for ri, row in enumerate(rows[1:], start=1):
-        if len(row) < 4 or not row[0].strip().isdigit() or not row[1].strip().isdigit():
-            continue
-        week, day = int(row[0]), int(row[1])
-        lift_name = row[3].strip()
+    # Bind the per-row helpers to locals; this loop runs once per sheet row
+    append, resolve = entries.append, resolve_lift
+    parse_scheme, parse_w, extract = parse_sets_reps_scheme, parse_weight, extract_performance
+    for ri, row, week, day in numbered:
+        lift_name = row[3]
         if not lift_name:
             continue
-        lift_id, lift_display = resolve_lift(lift_name)
+        lift_id, lift_display = resolve(lift_name)
         if not lift_id:
             continue
 
-        scheme = row[5].strip() if len(row) > 5 else ""
-        planned_weight_s = row[7].strip() if len(row) > 7 else ""
-        notes_s = row[8].strip() if len(row) > 8 else ""
+        scheme = row[5]
+        planned_weight_s = row[7]
+        notes_s = row[8]
         if not notes_s:
             continue
 
-        ps, pr = parse_sets_reps_scheme(scheme)
-        pw = parse_weight(planned_weight_s)
-        sets, reps, weight, notes_clean = extract_performance(notes_s, ps, pr, pw)
+        ps, pr = parse_scheme(scheme)
+        pw = parse_w(planned_weight_s)
+        sets, reps, weight, notes_clean = extract(notes_s, ps, pr, pw)
         if sets is None:
             continue
 
@@ -622,9 +738,9 @@ def parse_2025_03(rows, sheet_name):
         if not dt:
             continue
 
-        entries.append(Entry(dt, lift_id, lift_display, sets, reps,
-                             weight or 0.0, notes_clean, sheet_name,
-                             f"W{week}D{day}|{scheme}|{planned_weight_s}|{notes_s}"))
+        append(Entry(dt, lift_id, lift_display, sets, reps,
+                     weight or 0.0, notes_clean, sheet_name,
+                     f"W{week}D{day}|{scheme}|{planned_weight_s}|{notes_s}"))
     return entries
 
 
@@ -634,49 +750,40 @@ def parse_2025_03(rows, sheet_name):
 
 def parse_2025_07(rows, sheet_name):
     entries = []
+    rows = _pad_rows(rows, 8)
     year, _ = sheet_year(sheet_name)
     session_dates = {}
     last_month = 7
 
-    for row in rows[1:]:
-        if len(row) < 2 or not row[0].strip().isdigit() or not row[1].strip().isdigit():
-            continue
-        week, day = int(row[0]), int(row[1])
-        for ci in [7, 6]:
-            if len(row) > ci:
-                d = parse_month_day(row[ci].strip(), year, last_month)
-                if d:
-                    session_dates.setdefault((week, day), d)
-                    last_month = d.month
-                    break
-
-    all_sessions = sorted({
-        (int(r[0]), int(r[1]))
-        for r in rows[1:]
-        if len(r) >= 2 and r[0].strip().isdigit() and r[1].strip().isdigit()
-    })
+    numbered = _numbered_rows(rows)
+    for _, row, week, day in numbered:
+        d = _first_month_day(row, (7, 6), year, last_month)
+        if d:
+            session_dates.setdefault((week, day), d)
+            last_month = d.month
+
+    all_sessions = sorted({(week, day) for _, _, week, day in numbered})
     _fill_missing_dates(session_dates, all_sessions, timedelta(days=3))
 
-    for row in rows[1:]:
-        if len(row) < 3 or not row[0].strip().isdigit() or not row[1].strip().isdigit():
-            continue
-        week, day = int(row[0]), int(row[1])
-        lift_name = row[2].strip()
+    append, resolve = entries.append, resolve_lift
+    parse_scheme, parse_w, extract = parse_sets_reps_scheme, parse_weight, extract_performance
+    for _, row, week, day in numbered:
+        lift_name = row[2]
         if not lift_name:
             continue
-        lift_id, lift_display = resolve_lift(lift_name)
+        lift_id, lift_display = resolve(lift_name)
         if not lift_id:
             continue
 
-        scheme   = row[3].strip() if len(row) > 3 else ""
-        load_s   = row[5].strip() if len(row) > 5 else ""
-        notes_s  = row[6].strip() if len(row) > 6 else ""
+        scheme   = row[3]
+        load_s   = row[5]
+        notes_s  = row[6]
         if not notes_s:
             continue
 
-        ps, pr = parse_sets_reps_scheme(scheme)
-        pw = parse_weight(load_s)
-        sets, reps, weight, notes_clean = extract_performance(notes_s, ps, pr, pw)
+        ps, pr = parse_scheme(scheme)
+        pw = parse_w(load_s)
+        sets, reps, weight, notes_clean = extract(notes_s, ps, pr, pw)
         if sets is None:
             continue
 
@@ -684,9 +791,9 @@ def parse_2025_07(rows, sheet_name):
         if not dt:
             continue
 
-        entries.append(Entry(dt, lift_id, lift_display, sets, reps,
-                             weight or 0.0, notes_clean, sheet_name,
-                             f"W{week}D{day}|{scheme}|{load_s}|{notes_s}"))
+        append(Entry(dt, lift_id, lift_display, sets, reps,
+                     weight or 0.0, notes_clean, sheet_name,
+                     f"W{week}D{day}|{scheme}|{load_s}|{notes_s}"))
     return entries
 
 
@@ -696,18 +803,18 @@ def parse_2025_07(rows, sheet_name):
 
 def parse_2025_08(rows, sheet_name):
     entries = []
+    rows = _pad_rows(rows, 8)
     year, _ = sheet_year(sheet_name)
     session_dates = {}
     row_dates = {}   # row_idx → date for rows with an explicit date annotation
     last_month = 7
 
     def week_day(row):
-        ws = row[0].strip() if row else ""
-        ds = row[1].strip() if len(row) > 1 else ""
+        ws, ds = row[0], row[1]
         if not ws.isdigit():
             return None, None
         w = int(ws)
-        if re.match(r"^\d{1,2}/\d{1,2}$", ds):
+        if _RE_MD_ANCHORED.match(ds):
             d = parse_month_day(ds, year, last_month)
             return w, d
         return w, (int(ds) if ds.isdigit() else None)
@@ -722,38 +829,47 @@ def parse_2025_08(rows, sheet_name):
             row_dates[ri] = d_or_day
             continue
         day = d_or_day or 0
-        for ci in [7, 6]:
-            if len(row) > ci:
-                dv = parse_month_day(row[ci].strip(), year, last_month)
-                if dv:
-                    row_dates[ri] = dv
-                    session_dates.setdefault((w, day), dv)
-                    last_month = dv.month
-                    break
+        dv = _first_month_day(row, (7, 6), year, last_month)
+        if dv:
+            row_dates[ri] = dv
+            session_dates.setdefault((w, day), dv)
+            last_month = dv.month
 
     # Collect (week, day) pairs that have at least one recognized lift.
     # Excluding accessory-only days (Day 4, Day 5) prevents them from padding
     # the date-fill intervals and pushing real sessions to wrong dates.
+    # Each row's lift is resolved once here and reused by pass 2.
+    row_lift = {ri: resolve_lift(r[2]) for ri, r in enumerate(rows[1:], start=1) if r[2]}
     all_int_days = sorted({
         (int(r[0]), int(r[1]))
-        for r in rows[1:]
-        if (len(r) >= 2 and r[0].strip().isdigit() and r[1].strip().isdigit()
-            and not re.match(r"^\d{1,2}/\d{1,2}$", r[1].strip())
-            and len(r) > 2 and resolve_lift(r[2].strip())[0] is not None)
+        for ri, r in enumerate(rows[1:], start=1)
+        if (r[0].isdigit() and r[1].isdigit()
+            and not _RE_MD_ANCHORED.match(r[1])
+            and ri in row_lift and row_lift[ri][0] is not None)
     })
 
-    # Intra-week interpolation: fill sessions sandwiched between dated sessions in same week
+    # Intra-week interpolation: fill sessions sandwiched between dated sessions in same week.
+    # Dated days are grouped by week once; each filled day is inserted into its
+    # week so later days in that week interpolate from it.
+    week_days = {}
+    for (ww, dd) in session_dates:
+        week_days.setdefault(ww, []).append(dd)
+    for days in week_days.values():
+        days.sort()
     for (w, d) in all_int_days:
         if (w, d) in session_dates:
             continue
-        same_wk = {dd: session_dates[(ww, dd)] for (ww, dd) in session_dates if ww == w}
-        lows  = [dd for dd in same_wk if dd < d]
-        highs = [dd for dd in same_wk if dd > d]
-        if lows and highs:
-            bd, ad = max(lows), min(highs)
+        days = week_days.get(w)
+        if not days:
+            continue
+        i = bisect.bisect_left(days, d)
+        if 0 < i < len(days):
+            bd, ad = days[i - 1], days[i]
             t = (d - bd) / (ad - bd)
-            span = (same_wk[ad] - same_wk[bd]).days
-            session_dates[(w, d)] = same_wk[bd] + timedelta(days=int(t * span + 0.5))
+            before = session_dates[(w, bd)]
+            span = (session_dates[(w, ad)] - before).days
+            session_dates[(w, d)] = before + timedelta(days=int(t * span + 0.5))
+            days.insert(i, d)
 
     all_sessions = sorted(set(session_dates.keys()) | set(all_int_days))
     _fill_missing_dates(session_dates, all_sessions, timedelta(days=2))
@@ -762,59 +878,58 @@ def parse_2025_08(rows, sheet_name):
     # max(session_dates) reflects extrapolated end-of-sheet dates, not just annotated ones.
     # Each orphaned row gets the next consecutive Strava date (sequential assignment).
     _orphan_iter = iter([])
-    if session_dates and _strava_dates:
+    if session_dates and _strava_sorted:
         last_known = max(session_dates.values())
-        _orphan_iter = iter(sorted(d for d in _strava_dates if d > last_known))
+        _orphan_iter = iter(_strava_sorted[bisect.bisect_right(_strava_sorted, last_known):])
 
     # Pass 2: generate entries
+    append = entries.append
+    parse_w, extract = parse_weight, extract_performance
     for ri, row in enumerate(rows[1:], start=1):
         w, d_or_day = week_day(row)
         if w is None:
             # Orphaned row: no week number but may have a recognized lift.
             # Consume the next sequential Strava date only when we're about to emit an entry.
-            if len(row) > 2:
-                lift_name = row[2].strip()
-                if lift_name:
-                    lift_id, lift_display = resolve_lift(lift_name)
-                    if lift_id:
-                        notes = row[6].strip() if len(row) > 6 else ""
-                        if not notes:
-                            continue
-                        sets, reps, weight, notes_clean = extract_performance(
-                            notes, None, None, None)
-                        if sets is None:
-                            continue
-                        orphan_dt = next(_orphan_iter, None)
-                        if orphan_dt is None:
-                            continue
-                        entries.append(Entry(orphan_dt, lift_id, lift_display,
-                                             sets, reps, weight or 0.0,
-                                             notes_clean, sheet_name,
-                                             f"orphan|{orphan_dt}|{notes}"))
+            lift_name = row[2]
+            if lift_name:
+                lift_id, lift_display = row_lift[ri]
+                if lift_id:
+                    notes = row[6]
+                    if not notes:
+                        continue
+                    sets, reps, weight, notes_clean = extract(
+                        notes, None, None, None)
+                    if sets is None:
+                        continue
+                    orphan_dt = next(_orphan_iter, None)
+                    if orphan_dt is None:
+                        continue
+                    append(Entry(orphan_dt, lift_id, lift_display,
+                                 sets, reps, weight or 0.0,
+                                 notes_clean, sheet_name,
+                                 f"orphan|{orphan_dt}|{notes}"))
             continue
         day = 0 if isinstance(d_or_day, date) else (d_or_day or 0)
-        lift_name = row[2].strip() if len(row) > 2 else ""
+        lift_name = row[2]
         if not lift_name:
             continue
-        lift_id, lift_display = resolve_lift(lift_name)
+        lift_id, lift_display = row_lift[ri]
         if not lift_id:
             continue
 
-        ps_s  = row[3].strip() if len(row) > 3 else ""
-        pr_s  = row[4].strip() if len(row) > 4 else ""
-        w_s   = row[5].strip() if len(row) > 5 else ""
-        notes = row[6].strip() if len(row) > 6 else ""
+        ps_s  = row[3]
+        pr_s  = row[4]
+        w_s   = row[5]
+        notes = row[6]
         if not notes:
             continue
 
-        try:
-            ps = int(ps_s) if ps_s.isdigit() else None
-            pr = int(pr_s) if pr_s.isdigit() else None
-        except ValueError:
-            ps = pr = None
+        # isdecimal(), unlike isdigit(), admits nothing int() rejects (e.g. "²")
+        ps = int(ps_s) if ps_s.isdecimal() else None
+        pr = int(pr_s) if pr_s.isdecimal() else None
 
-        pw = parse_weight(w_s)
-        sets, reps, weight, notes_clean = extract_performance(notes, ps, pr, pw)
+        pw = parse_w(w_s)
+        sets, reps, weight, notes_clean = extract(notes, ps, pr, pw)
         if sets is None:
             continue
 
@@ -823,9 +938,9 @@ def parse_2025_08(rows, sheet_name):
         if not dt:
             continue
 
-        entries.append(Entry(dt, lift_id, lift_display, sets, reps,
-                             weight or 0.0, notes_clean, sheet_name,
-                             f"W{w}D{day}|{ps_s}x{pr_s}|{w_s}|{notes}"))
+        append(Entry(dt, lift_id, lift_display, sets, reps,
+                     weight or 0.0, notes_clean, sheet_name,
+                     f"W{w}D{day}|{ps_s}x{pr_s}|{w_s}|{notes}"))
     return entries
 
 
@@ -839,14 +954,13 @@ def parse_2025_09(rows, sheet_name):
         return entries
 
     header = rows[0]
+    data = _pad_rows(rows[1:], 3)  # every cell stripped once, label columns always present
     year = 2025
     last_month = 8
 
     cycle_cols = []
-    for i, cell in enumerate(header):
-        if i < 4:
-            continue
-        m = re.search(r"(\d{1,2}/\d{1,2})", str(cell))
+    for i, cell in enumerate(header[4:], start=4):
+        m = _RE_MD.search(str(cell))
         if m:
             d = parse_month_day(m.group(1), year, last_month)
             if d:
@@ -857,10 +971,10 @@ def parse_2025_09(rows, sheet_name):
         return entries
 
     day_order = {}
-    for row in rows[1:]:
-        label = row[0].strip() if row else ""
-        if label and label not in day_order:
-            day_order[label] = len(day_order)
+    for row in data:
+        label = row[0]
+        if label:
+            day_order.setdefault(label, len(day_order))  # first-seen position
 
     def session_date(cycle_start, cycle_end, day_label):
         offset = day_order.get(day_label, 0)
@@ -871,24 +985,22 @@ def parse_2025_09(rows, sheet_name):
         span = (cycle_end - cycle_start).days
         return cycle_start + timedelta(days=int(offset * span / n + 0.5))
 
-    for row in rows[1:]:
-        if len(row) < 2:
-            continue
-        day_label = row[0].strip()
-        lift_name = row[1].strip()
+    for row in data:
+        day_label = row[0]
+        lift_name = row[1]
         if not lift_name:
             continue
         lift_id, lift_display = resolve_lift(lift_name)
         if not lift_id:
             continue
 
-        scheme = row[2].strip() if len(row) > 2 else ""
+        scheme = row[2]
         ps, pr = parse_sets_reps_scheme(scheme)
 
         for ci, (col_i, cycle_start) in enumerate(cycle_cols):
             if col_i >= len(row):
                 continue
-            cell = row[col_i].strip()
+            cell = row[col_i]
             if not cell:
                 continue
 
@@ -933,25 +1045,25 @@ def parse_2025_11(rows, sheet_name):
         return entries
 
     header = rows[0]
+    rows = rows[:1] + _pad_rows(rows[1:], 3)  # data cells stripped once per sheet
     year = 2025
     last_month = 11
 
     # --- Step 1: Find all session columns (with date or blank-but-has-data) ---
     # We'll store (col_index, date_or_None) and fill in None by interpolation later.
     raw_cols = []  # list of (col_index, date|None)
-    for i, cell in enumerate(header):
-        if i < 5:
-            continue
-        cell_s = str(cell).strip()
+    # Session columns holding any data, found in one pass over the (stripped) rows
+    data_cols = {i for r in rows[1:] for i in range(5, len(r)) if r[i]}
+    header_s = [str(c).strip() for c in header[5:]]  # stripped once
+    for i, cell_s in enumerate(header_s, start=5):
         d = parse_month_day(cell_s, year, last_month) if cell_s else None
         if d:
             raw_cols.append((i, d))
             last_month = d.month
             year = d.year   # carry year forward so Jan/Feb correctly become 2026
         elif not cell_s:
-            # Blank header — check for any data in this column
-            has_data = any(len(r) > i and str(r[i]).strip() for r in rows[1:])
-            if has_data:
+            # Blank header — keep the column if it has any data
+            if i in data_cols:
                 raw_cols.append((i, None))
 
     # Interpolate dates for blank-header columns.
@@ -962,18 +1074,18 @@ def parse_2025_11(rows, sheet_name):
             prev_dt = next((raw_cols[k][1] for k in range(j - 1, -1, -1) if raw_cols[k][1]), None)
             next_dt = next((raw_cols[k][1] for k in range(j + 1, len(raw_cols)) if raw_cols[k][1]), None)
             if prev_dt and next_dt:
-                gap = sorted(d for d in _strava_dates if prev_dt < d < next_dt)
-                if gap:
-                    raw_cols[j] = (col_i, gap[0])
+                gap = _strava_after(prev_dt)
+                if gap and gap < next_dt:
+                    raw_cols[j] = (col_i, gap)
                 else:
                     span = (next_dt - prev_dt).days
                     raw_cols[j] = (col_i, prev_dt + timedelta(days=span // 2))
             elif prev_dt:
-                after = sorted(d for d in _strava_dates if d > prev_dt)
-                raw_cols[j] = (col_i, after[0] if after else prev_dt + timedelta(days=7))
+                after = _strava_after(prev_dt)
+                raw_cols[j] = (col_i, after or prev_dt + timedelta(days=7))
             elif next_dt:
-                before = sorted(d for d in _strava_dates if d < next_dt)
-                raw_cols[j] = (col_i, before[-1] if before else next_dt - timedelta(days=7))
+                before = _strava_before(next_dt)
+                raw_cols[j] = (col_i, before or next_dt - timedelta(days=7))
 
     rotation_cols = [(ci, dt) for ci, dt in raw_cols if dt is not None]
     if not rotation_cols:
@@ -983,7 +1095,7 @@ def parse_2025_11(rows, sheet_name):
     sections = []  # list of lists of row indices
     current = []
     for i, row in enumerate(rows[1:], start=1):
-        name = row[0].strip() if row else ""
+        name = row[0]
         if name:
             current.append(i)
         else:
@@ -1008,53 +1120,46 @@ def parse_2025_11(rows, sheet_name):
         span = (rot_end - rot_start).days
         return rot_start + timedelta(days=int(sect_idx * span / n_sections + 0.5))
 
-    # --- Step 4: Parse cells with ditto carry-forward ---
-    # last_known_cell[(row_idx, rot_list_idx)] = resolved cell string
-    last_known_cell = {}
+    # Only len(rotation_cols) × n_sections distinct dates; work them out once
+    # rather than once per lift row
+    section_dates = [[section_date(rot_idx, sect_idx) for sect_idx in range(n_sections)]
+                     for rot_idx in range(len(rotation_cols))]
 
+    # --- Step 4: Parse cells with ditto carry-forward ---
     for sect_idx, row_indices in enumerate(sections):
         for row_idx in row_indices:
             row = rows[row_idx]
-            lift_name = row[0].strip() if row else ""
+            lift_name = row[0]
             lift_id, lift_display = resolve_lift(lift_name)
             if not lift_id:
                 continue
 
-            scheme = row[2].strip() if len(row) > 2 else ""
+            scheme = row[2]
             ps, pr = parse_sets_reps_scheme(scheme)
 
+            # Rotations are visited in order, so the most recent prior
+            # rotation with a known value is simply the last one kept
+            last_cell = ""
             for rot_idx, (col_i, _) in enumerate(rotation_cols):
-                cell = row[col_i].strip() if col_i < len(row) else ""
+                cell = row[col_i] if col_i < len(row) else ""
 
                 # Resolve ditto marks
                 if is_ditto(cell):
-                    # Find most recent prior rotation with a known value
-                    cell = next(
-                        (last_known_cell[(row_idx, k)]
-                         for k in range(rot_idx - 1, -1, -1)
-                         if (row_idx, k) in last_known_cell),
-                        ""
-                    )
+                    cell = last_cell
                     if not cell:
                         continue
                 else:
                     suffix = ditto_suffix(cell)
                     if suffix is not None:
                         # e.g. '" go up' — use prev weight/sets/reps but keep suffix as note
-                        prev = next(
-                            (last_known_cell[(row_idx, k)]
-                             for k in range(rot_idx - 1, -1, -1)
-                             if (row_idx, k) in last_known_cell),
-                            ""
-                        )
                         # Parse weight from prev to carry it, append suffix as the note text
-                        cell = (prev + " " + suffix).strip() if prev else suffix
+                        cell = (last_cell + " " + suffix).strip() if last_cell else suffix
 
                 if not cell:
                     continue
 
-                last_known_cell[(row_idx, rot_idx)] = cell
-                dt = section_date(rot_idx, sect_idx)
+                last_cell = cell
+                dt = section_dates[rot_idx][sect_idx]
 
                 groups = _parse_multi_group(cell, ps, pr)
                 if groups:
@@ -1086,15 +1191,14 @@ def parse_2025_09_08(rows, sheet_name):
         return entries
 
     header = rows[0]
+    data = _pad_rows(rows[1:], 3)  # every cell stripped once, label columns always present
     year = 2025
     last_month = 9
 
     # Parse session dates from header cols 5+
     session_cols = []  # [(col_index, date), ...]
-    for i, cell in enumerate(header):
-        if i < 5:
-            continue
-        m = re.search(r"(\d{1,2})[/\-](\d{1,2})(?:[/\-]\d{2,4})?", str(cell))
+    for i, cell in enumerate(header[5:], start=5):
+        m = _RE_MD_DASH.search(str(cell))
         if m:
             month, day = int(m.group(1)), int(m.group(2))
             try:
@@ -1112,11 +1216,10 @@ def parse_2025_09_08(rows, sheet_name):
 
     # Build day_label order from col 2 (for within-cycle date offset)
     day_order = {}
-    for row in rows[1:]:
-        if len(row) > 2:
-            label = row[2].strip()
-            if label and label not in day_order:
-                day_order[label] = len(day_order)
+    for row in data:
+        label = row[2]
+        if label:
+            day_order.setdefault(label, len(day_order))  # first-seen position
 
     def section_date(cycle_start, cycle_end, day_label):
         offset = day_order.get(day_label, 0)
@@ -1127,24 +1230,22 @@ def parse_2025_09_08(rows, sheet_name):
         span = (cycle_end - cycle_start).days
         return cycle_start + timedelta(days=int(offset * span / n + 0.5))
 
-    for row in rows[1:]:
-        if not row:
-            continue
-        lift_name = row[0].strip() if row else ""
+    for row in data:
+        lift_name = row[0]
         if not lift_name:
             continue
         lift_id, lift_display = resolve_lift(lift_name)
         if not lift_id:
             continue
 
-        detail = row[1].strip() if len(row) > 1 else ""
+        detail = row[1]
         ps, pr = parse_sets_reps_scheme(detail)
-        day_label = row[2].strip() if len(row) > 2 else ""
+        day_label = row[2]
 
         for ci, (col_i, cycle_start) in enumerate(session_cols):
             if col_i >= len(row):
                 continue
-            cell = row[col_i].strip()
+            cell = row[col_i]
             if not cell:
                 continue
 
@@ -1215,24 +1316,33 @@ def parse_2026_02(rows, sheet_name):
 # Reasonableness checker
 # ---------------------------------------------------------------------------
 
+_BARBELL_LIFTS = frozenset({"barbell_bench_press", "back_squat", "deadlift",
+                            "trap_bar_deadlift", "strict_press", "rdl", "front_squat"})
+
+
 def check_reasonableness(entries):
     """
     Flag suspicious entries. Returns entries with .flag set where applicable.
     Also prints a summary report.
     """
     from collections import defaultdict
-
-    # Group by lift_id, sorted by date
-    by_lift = defaultdict(list)
-    for e in entries:
-        by_lift[e.lift_id].append(e)
-    for lift_id in by_lift:
-        by_lift[lift_id].sort(key=lambda e: e.dt)
+    from itertools import groupby
+
+    # Group by lift_id, sorted by date: one sort on (lift, date), then split
+    # the runs, instead of bucketing and sorting each lift's list
+    by_lift = {
+        lift_id: list(group)
+        for lift_id, group in groupby(sorted(entries, key=attrgetter("lift_id", "dt")),
+                                      key=attrgetter("lift_id"))
+    }
 
     flags = []
+    progression = []  # (first, last, peak weight) entries per lift, for the summary
 
     for lift_id, lift_entries in by_lift.items():
         prev_weight = None
+        first = last = peak = None
+        n_weighted = 0
 
         for e in lift_entries:
             reasons = []
@@ -1242,8 +1352,7 @@ def check_reasonableness(entries):
                 reasons.append(f"high_volume:{e.sets}x{e.reps}={e.sets*e.reps}")
 
             # Weight sanity for barbell lifts
-            if lift_id in ("barbell_bench_press", "back_squat", "deadlift",
-                           "trap_bar_deadlift", "strict_press", "rdl", "front_squat"):
+            if lift_id in _BARBELL_LIFTS:
                 if e.weight and e.weight > 500:
                     reasons.append(f"weight_too_high:{e.weight}")
                 if e.weight == 0.0:
@@ -1259,10 +1368,20 @@ def check_reasonableness(entries):
 
             if reasons:
                 e.flag = "; ".join(reasons)
+                e.flag_types = frozenset(r.split(":", 1)[0] for r in reasons)
                 flags.append(e)
 
             if e.weight:
                 prev_weight = e.weight
+                if e.weight > 0:
+                    n_weighted += 1
+                    first = first or e
+                    last = e
+                    if peak is None or e.weight > peak:
+                        peak = e.weight
+
+        if n_weighted >= 3:
+            progression.append((first, last, peak))
 
     print(f"\n{'='*60}")
     print(f"REASONABLENESS CHECK: {len(flags)} flagged entries")
@@ -1270,8 +1389,7 @@ def check_reasonableness(entries):
 
     by_flag_type = defaultdict(list)
     for e in flags:
-        for reason in e.flag.split("; "):
-            key = reason.split(":")[0]
+        for key in e.flag_types:
             by_flag_type[key].append(e)
 
     for flag_type, flag_entries in sorted(by_flag_type.items()):
@@ -1283,16 +1401,12 @@ def check_reasonableness(entries):
     print(f"\n{'='*60}")
     print("WEIGHT PROGRESSION SUMMARY (lifts with >= 3 non-zero sessions)")
     print(f"{'='*60}")
-    for lift_id, lift_entries in sorted(by_lift.items()):
-        weighted = [e for e in lift_entries if e.weight and e.weight > 0]
-        if len(weighted) < 3:
-            continue
-        first_w = weighted[0].weight
-        last_w = weighted[-1].weight
-        max_w = max(e.weight for e in weighted)
-        dates = f"{weighted[0].dt} → {weighted[-1].dt}"
+    for first, last, max_w in progression:  # already in lift_id order
+        first_w = first.weight
+        last_w = last.weight
+        dates = f"{first.dt} → {last.dt}"
         trend = "↑" if last_w > first_w * 1.05 else ("↓" if last_w < first_w * 0.95 else "~")
-        name = weighted[0].lift_name
+        name = first.lift_name
         print(f"  {trend} {name:35s} {first_w:>6.1f} → {last_w:>6.1f}  (peak {max_w:>6.1f})  {dates}")
 
     return entries
@@ -1307,7 +1421,8 @@ def suggest_action(e) -> str:
     if not e.flag:
         return ""
 
-    flag_types = {f.split(":")[0].strip() for f in e.flag.split(";")}
+    # Recorded by check_reasonableness; parse the string for flags set any other way
+    flag_types = e.flag_types or {f.split(":")[0].strip() for f in e.flag.split(";")}
     w, d = e.weight, e.dt
 
     # ── specific cases ───────────────────────────────────────────────────────
@@ -1373,35 +1488,31 @@ _ROW_COLORS = {
 }
 
 
-def write_preview(service, entries):
-    ss = service.spreadsheets()
+# Rows per updateCells request when writing the preview tab
+_PREVIEW_CHUNK_ROWS = 10000
 
-    # Delete existing preview sheet if present
-    meta = ss.get(spreadsheetId=SPREADSHEET_ID).execute()
-    existing = [s["properties"] for s in meta["sheets"]
-                if s["properties"]["title"] == PREVIEW_SHEET_NAME]
 
-    requests = []
-    if existing:
-        requests.append({"deleteSheet": {"sheetId": existing[0]["sheetId"]}})
-    requests.append({"addSheet": {"properties": {"title": PREVIEW_SHEET_NAME}}})
-    ss.batchUpdate(spreadsheetId=SPREADSHEET_ID, body={"requests": requests}).execute()
+def _cell_data(value):
+    """Wrap a value as Sheets CellData, stored the way valueInputOption=RAW would."""
+    if value == "":
+        return {}
+    if isinstance(value, (int, float)):
+        return {"userEnteredValue": {"numberValue": value}}
+    return {"userEnteredValue": {"stringValue": str(value)}}
 
-    meta2 = ss.get(spreadsheetId=SPREADSHEET_ID).execute()
-    sheet_id = next(
-        s["properties"]["sheetId"] for s in meta2["sheets"]
-        if s["properties"]["title"] == PREVIEW_SHEET_NAME
-    )
 
-    sorted_entries = sorted(entries, key=lambda x: (x.dt, x.lift_id))
+def write_preview(service, sorted_entries):
+    """Write entries (already sorted by date, lift) to the preview tab."""
+    ss = service.spreadsheets()
 
-    header = ["date", "lift_id", "lift_name", "sets", "reps", "weight", "notes",
-              "flag", "recommendation", "your_decision", "source_sheet", "raw_text"]
+    # Same leading columns as entries.csv (up to flag), then review columns
+    header = [*CSV_COLUMNS[:CSV_COLUMNS.index("flag") + 1],
+              "recommendation", "your_decision", "source_sheet", "raw_text"]
     data_rows = [header]
-    for e in sorted_entries:
-        rec = suggest_action(e)
+    recs = [suggest_action(e) for e in sorted_entries]  # reused for row colours
+    for e, rec in zip(sorted_entries, recs):
         data_rows.append([
-            e.dt.strftime("%Y-%m-%d"),
+            e.dt.isoformat(),
             e.lift_id,
             e.lift_name,
             e.sets or "",
@@ -1415,12 +1526,24 @@ def write_preview(service, entries):
             e.raw,
         ])
 
-    ss.values().update(
-        spreadsheetId=SPREADSHEET_ID,
-        range=f"'{PREVIEW_SHEET_NAME}'!A1",
-        valueInputOption="RAW",
-        body={"values": data_rows}
-    ).execute()
+    # Replace the preview sheet, fill it and format it in a single batchUpdate.
+    # Choosing the new sheetId up front lets the later requests refer to it
+    # without waiting on the addSheet reply.
+    meta = ss.get(spreadsheetId=SPREADSHEET_ID,
+                  fields="sheets.properties(sheetId,title)").execute()
+    sheets = [s["properties"] for s in meta["sheets"]]
+    existing = [p for p in sheets if p["title"] == PREVIEW_SHEET_NAME]
+    sheet_id = max(p["sheetId"] for p in sheets) + 1
+
+    requests = []
+    if existing:
+        requests.append({"deleteSheet": {"sheetId": existing[0]["sheetId"]}})
+    requests.append({"addSheet": {"properties": {
+        "sheetId": sheet_id,
+        "title": PREVIEW_SHEET_NAME,
+        "gridProperties": {"rowCount": max(len(data_rows), 1000),
+                           "columnCount": max(len(header), 26)},
+    }}})
 
     # ── formatting ────────────────────────────────────────────────────────────
     fmt_requests = [
@@ -1447,19 +1570,25 @@ def write_preview(service, entries):
         }},
     ]
 
-    # Colour-code flagged rows by recommendation type
+    # Colour-code flagged rows by recommendation type. Adjacent rows with the
+    # same colour are merged into one [start, end) run → one repeatCell each.
     flagged_row_indices = []
-    for i, e in enumerate(sorted_entries):
+    runs = []
+    for i, (e, rec) in enumerate(zip(sorted_entries, recs)):
         if not e.flag:
             continue
         ri = i + 1  # 0-indexed row (header = 0)
         flagged_row_indices.append(ri)
-        rec = suggest_action(e)
-        lead = rec.split("—")[0].strip() if rec else "REVIEW"
+        lead = rec.split("—", 1)[0].strip() if rec else "REVIEW"
         bg = _ROW_COLORS.get(lead, _ROW_COLORS["REVIEW"])
+        if runs and runs[-1][1] == ri and runs[-1][2] == bg:
+            runs[-1][1] = ri + 1
+        else:
+            runs.append([ri, ri + 1, bg])
+    for start, end, bg in runs:
         fmt_requests.append({"repeatCell": {
             "range": {"sheetId": sheet_id,
-                      "startRowIndex": ri, "endRowIndex": ri + 1},
+                      "startRowIndex": start, "endRowIndex": end},
             "cell": {"userEnteredFormat": {"backgroundColor": bg}},
             "fields": "userEnteredFormat.backgroundColor"
         }})
@@ -1488,8 +1617,23 @@ def write_preview(service, entries):
         },
     }})
 
-    ss.batchUpdate(spreadsheetId=SPREADSHEET_ID,
-                   body={"requests": fmt_requests}).execute()
+    # Cell values go in _PREVIEW_CHUNK_ROWS-row updateCells requests. A normal
+    # preview fits in one, so everything is still a single batchUpdate; a very
+    # large one is split across calls to stay under the request size limit,
+    # with the formatting sent last so column auto-resize sees every row.
+    cell_rows = [{"values": [_cell_data(v) for v in row]} for row in data_rows]
+    batches = [requests]
+    for start in range(0, len(cell_rows), _PREVIEW_CHUNK_ROWS):
+        if start:
+            batches.append([])
+        batches[-1].append({"updateCells": {
+            "start": {"sheetId": sheet_id, "rowIndex": start, "columnIndex": 0},
+            "rows": cell_rows[start:start + _PREVIEW_CHUNK_ROWS],
+            "fields": "userEnteredValue",
+        }})
+    batches[-1].extend(fmt_requests)
+    for batch in batches:
+        ss.batchUpdate(spreadsheetId=SPREADSHEET_ID, body={"requests": batch}).execute()
 
     print(f"Preview written: {len(data_rows) - 1} entries → '{PREVIEW_SHEET_NAME}'")
     print(f"  ({len(flagged_row_indices)} flagged rows colour-coded by recommendation)")
@@ -1499,136 +1643,159 @@ def write_preview(service, entries):
 # Manual corrections and filters
 # ---------------------------------------------------------------------------
 
+# Weight-only overrides: (date, lift_id) → new weight in lbs
+_WEIGHT_OVERRIDES = {
+    (date(2025,  4,  9), "barbell_bench_press"): 125.0,
+    (date(2025,  4, 15), "barbell_bench_press"): 165.0,
+    (date(2025,  4,  6), "farmers_carry"):        50.0,
+    (date(2025,  5, 15), "farmers_carry"):         60.0,
+    (date(2025,  7,  4), "dips"):                  55.0,
+    (date(2025, 12,  4), "rdl"):                   97.0,  # 22*2 kg → lbs
+    (date(2025, 12,  4), "back_squat"):           188.0,  # smith 85 kg → lbs (user)
+    (date(2025, 12, 11), "barbell_bench_press"):  160.0,
+    (date(2025, 12, 18), "back_squat"):           205.0,  # user confirmed
+}
+
+# Trap-bar deadlift entries before this date were logged 20 lbs light
+_TRAP_CUTOFF_DATE = date(2025, 12, 11)
+
+# The calf_raise logged on this date was really a leg extension
+_CALF_RELABEL_DATE = date(2025, 12, 3)
+
+# Sets/reps overrides: (date, lift_id) → (sets, reps)
+_SETS_REPS_OVERRIDES = {
+    (date(2025, 6, 11), "back_squat"): (1, 5),
+}
+
+
+def _build_corrections():
+    """Fold the per-key fixes above into (date, lift_id) → {field: value}."""
+    table = {}
+    for key, weight in _WEIGHT_OVERRIDES.items():
+        table.setdefault(key, {})["weight"] = weight
+    for key, (sets, reps) in _SETS_REPS_OVERRIDES.items():
+        table.setdefault(key, {}).update(sets=sets, reps=reps)
+    # Lift-type change: 2025-12-03 calf_raise → leg_extension @25 kg
+    table.setdefault((_CALF_RELABEL_DATE, "calf_raise"), {}).update(
+        lift_id="leg_extension",
+        lift_name="Leg Extension",
+        weight=round(25 * 2.20462),  # 25 kg → 55 lbs
+    )
+    return table
+
+
+_CORRECTIONS = _build_corrections()
+
+# Entries to delete, by (date, lift_id, sets, reps)
+_DELETIONS = frozenset({
+    # "160 3x5. good, go 3x6" — the "3x5" was the plan, "go 3x6" was parsed
+    # as a second entry; user wants only the 3x6 entry kept
+    (date(2025, 12, 11), "barbell_bench_press", 3, 5),
+    # Injury-period zero-weight substitution entries
+    (date(2025, 10,  8), "barbell_bench_press", 3, 20),  # Upper 1 offset=0 → Strava 10/8
+    (date(2025, 10,  6), "strict_press",        3,  8),  # Upper 2 in 10/2–10/8 cycle
+    (date(2025, 10, 10), "strict_press",        3, 20),  # Upper 2 in 10/8–10/16 cycle
+    (date(2025, 10, 31), "strict_press",        3, 10),  # Upper 2 in 10/28–11/3 cycle
+    # Spurious parse from note text
+    (date(2025,  9, 20), "front_squat",         3,  7),
+    # User decisions from import-preview review
+    (date(2025,  9, 29), "strict_press",        3, 10),  # seated DB press sub during injury
+    (date(2025, 10, 16), "barbell_bench_press", 3, 10),  # DB bench sub during injury
+    (date(2025, 10, 23), "strict_press",        3,  6),  # DB press sub during injury
+    (date(2025, 11, 19), "back_squat",          3, 12),  # 50# dumbbell sub (not a real squat)
+    (date(2025, 11, 19), "rdl",                 3, 15),  # 50# dumbbell sub
+    (date(2025, 12,  4), "calf_raise",          3,  8),  # "leg curls 25kg" mislabeled
+    # Outlier cleanup (user review 2026-02)
+    (date(2025, 10,  2), "barbell_bench_press", 3, 12),  # 50 lbs — injury-period low outlier
+    (date(2025,  9, 22), "hammer_curl",         3, 10),  # 60 lbs — erroneous high
+    (date(2025,  9, 29), "hammer_curl",         3, 12),  # 60 lbs — erroneous high
+    (date(2025,  9, 14), "incline_db_curl",     3, 12),  # 50 lbs — outlier high
+    (date(2025, 10, 28), "incline_db_curl",     3, 12),  # 60 lbs — outlier high
+    (date(2025, 11, 11), "incline_db_curl",     3, 10),  # 60 lbs — outlier high
+})
+
+# Full replacements: every existing (date, lift_id) entry is dropped and
+# these (sets, reps, weight, note) rows inserted instead
+_REPLACEMENTS = {
+    # 2025-07-06 session (manually supplied — not in any sheet)
+    (date(2025, 7,  6), "barbell_bench_press"):   [(4, 6, 140.0, "")],
+    (date(2025, 7,  6), "rdl"):                   [(4, 8, 145.0, "")],
+    (date(2025, 7,  6), "bulgarian_split_squat"): [(3, 8,  20.0, "")],
+    # 2026-01-22 weighted pull-ups: ramped warm-up, 3 reps each weight
+    (date(2026, 1, 22), "weighted_pull_ups"): [
+        (1, 3,   0, "warmup ladder"),
+        (1, 3,  10, "warmup ladder"),
+        (1, 3,  15, "warmup ladder"),
+        (1, 3,  20, "warmup ladder"),
+        (1, 3,  25, "warmup ladder"),
+    ],
+    # 2025-07-17 lat pulldown: ramped sets, 10 reps each weight
+    (date(2025, 7, 17), "lat_pulldown"): [
+        (1, 10, 140, "ramped"),
+        (1, 10, 145, "ramped"),
+        (1, 10, 150, "ramped"),
+    ],
+    # 2025-08-03 weighted pull-ups: 25# 4/4/2
+    (date(2025, 8,  3), "weighted_pull_ups"): [
+        (1, 4, 25, ""),
+        (1, 4, 25, ""),
+        (1, 2, 25, ""),
+    ],
+}
+
+
 def apply_manual_corrections(entries):
     """Apply hardcoded per-entry corrections and exclusions."""
 
     # ----------------------------------------------------------------
-    # 1. Weight-only overrides: (date, lift_id) → new weight in lbs
-    # ----------------------------------------------------------------
-    weight_overrides = {
-        (date(2025,  4,  9), "barbell_bench_press"): 125.0,
-        (date(2025,  4, 15), "barbell_bench_press"): 165.0,
-        (date(2025,  4,  6), "farmers_carry"):        50.0,
-        (date(2025,  5, 15), "farmers_carry"):         60.0,
-        (date(2025,  7,  4), "dips"):                  55.0,
-        (date(2025, 12,  4), "rdl"):                   97.0,  # 22*2 kg → lbs
-        (date(2025, 12,  4), "back_squat"):           188.0,  # smith 85 kg → lbs (user)
-        (date(2025, 12, 11), "barbell_bench_press"):  160.0,
-        (date(2025, 12, 18), "back_squat"):           205.0,  # user confirmed
-    }
-    for e in entries:
-        new_w = weight_overrides.get((e.dt, e.lift_id))
-        if new_w is not None:
-            e.weight = new_w
-
-    # ----------------------------------------------------------------
-    # 1b. Trap-bar deadlift calibration: all entries before 2025-12-11
-    #     were logged 20 lbs light (bar + plates miscounted); add 20.
+    # 1–3. Per-entry fixes, applied in one pass. Each step reads the entry
+    #      as left by the previous one, so their order matters.
     # ----------------------------------------------------------------
+    kept = []
+    replaced = {}  # (date, lift_id) → first surviving entry with that key
     for e in entries:
-        if e.lift_id == "trap_bar_deadlift" and e.dt < date(2025, 12, 11):
+        # 1. Weight, sets/reps and lift-type overrides: one lookup per entry
+        fix = _CORRECTIONS.get((e.dt, e.lift_id))
+        if fix:
+            for field, value in fix.items():
+                setattr(e, field, value)
+
+        # 2. Trap-bar deadlift calibration: all entries before 2025-12-11
+        #    were logged 20 lbs light (bar + plates miscounted); add 20.
+        if e.lift_id == "trap_bar_deadlift" and e.dt < _TRAP_CUTOFF_DATE:
             e.weight = (e.weight or 0.0) + 20.0
 
-    # ----------------------------------------------------------------
-    # 2. Sets/reps overrides: (date, lift_id) → (sets, reps)
-    # ----------------------------------------------------------------
-    sets_reps_overrides = {
-        (date(2025, 6, 11), "back_squat"): (1, 5),
-    }
-    for e in entries:
-        override = sets_reps_overrides.get((e.dt, e.lift_id))
-        if override:
-            e.sets, e.reps = override
-
-    # ----------------------------------------------------------------
-    # 3. Lift-type change: 2025-12-03 calf_raise → leg_extension @25 kg
-    # ----------------------------------------------------------------
-    for e in entries:
-        if e.dt == date(2025, 12, 3) and e.lift_id == "calf_raise":
-            e.lift_id = "leg_extension"
-            e.lift_name = "Leg Extension"
-            e.weight = round(25 * 2.20462)  # 25 kg → 55 lbs
+        # 3. Delete specific entries by (date, lift_id, sets, reps)
+        if (e.dt, e.lift_id, e.sets, e.reps) in _DELETIONS:
+            continue
 
-    # ----------------------------------------------------------------
-    # 4. Delete specific entries by (date, lift_id, sets, reps)
-    # ----------------------------------------------------------------
-    deletions = {
-        # "160 3x5. good, go 3x6" — the "3x5" was the plan, "go 3x6" was parsed
-        # as a second entry; user wants only the 3x6 entry kept
-        (date(2025, 12, 11), "barbell_bench_press", 3, 5),
-        # Injury-period zero-weight substitution entries
-        (date(2025, 10,  8), "barbell_bench_press", 3, 20),  # Upper 1 offset=0 → Strava 10/8
-        (date(2025, 10,  6), "strict_press",        3,  8),  # Upper 2 in 10/2–10/8 cycle
-        (date(2025, 10, 10), "strict_press",        3, 20),  # Upper 2 in 10/8–10/16 cycle
-        (date(2025, 10, 31), "strict_press",        3, 10),  # Upper 2 in 10/28–11/3 cycle
-        # Spurious parse from note text
-        (date(2025,  9, 20), "front_squat",         3,  7),
-        # User decisions from import-preview review
-        (date(2025,  9, 29), "strict_press",        3, 10),  # seated DB press sub during injury
-        (date(2025, 10, 16), "barbell_bench_press", 3, 10),  # DB bench sub during injury
-        (date(2025, 10, 23), "strict_press",        3,  6),  # DB press sub during injury
-        (date(2025, 11, 19), "back_squat",          3, 12),  # 50# dumbbell sub (not a real squat)
-        (date(2025, 11, 19), "rdl",                 3, 15),  # 50# dumbbell sub
-        (date(2025, 12,  4), "calf_raise",          3,  8),  # "leg curls 25kg" mislabeled
-        # Outlier cleanup (user review 2026-02)
-        (date(2025, 10,  2), "barbell_bench_press", 3, 12),  # 50 lbs — injury-period low outlier
-        (date(2025,  9, 22), "hammer_curl",         3, 10),  # 60 lbs — erroneous high
-        (date(2025,  9, 29), "hammer_curl",         3, 12),  # 60 lbs — erroneous high
-        (date(2025,  9, 14), "incline_db_curl",     3, 12),  # 50 lbs — outlier high
-        (date(2025, 10, 28), "incline_db_curl",     3, 12),  # 60 lbs — outlier high
-        (date(2025, 11, 11), "incline_db_curl",     3, 10),  # 60 lbs — outlier high
-    }
-    entries = [e for e in entries
-               if (e.dt, e.lift_id, e.sets, e.reps) not in deletions]
+        # 4 (below) replaces these outright; keep the first one seen per
+        # key, which is all it needs
+        key = (e.dt, e.lift_id)
+        if key in _REPLACEMENTS:
+            replaced.setdefault(key, e)
+            continue
+        kept.append(e)
 
     # ----------------------------------------------------------------
-    # 5. Full replacements: remove all existing (date, lift_id) entries
+    # 4. Full replacements: remove all existing (date, lift_id) entries
     #    and insert the specified new ones
     # ----------------------------------------------------------------
-    replacements = {
-        # 2025-07-06 session (manually supplied — not in any sheet)
-        (date(2025, 7,  6), "barbell_bench_press"):   [(4, 6, 140.0, "")],
-        (date(2025, 7,  6), "rdl"):                   [(4, 8, 145.0, "")],
-        (date(2025, 7,  6), "bulgarian_split_squat"): [(3, 8,  20.0, "")],
-        # 2026-01-22 weighted pull-ups: ramped warm-up, 3 reps each weight
-        (date(2026, 1, 22), "weighted_pull_ups"): [
-            (1, 3,   0, "warmup ladder"),
-            (1, 3,  10, "warmup ladder"),
-            (1, 3,  15, "warmup ladder"),
-            (1, 3,  20, "warmup ladder"),
-            (1, 3,  25, "warmup ladder"),
-        ],
-        # 2025-07-17 lat pulldown: ramped sets, 10 reps each weight
-        (date(2025, 7, 17), "lat_pulldown"): [
-            (1, 10, 140, "ramped"),
-            (1, 10, 145, "ramped"),
-            (1, 10, 150, "ramped"),
-        ],
-        # 2025-08-03 weighted pull-ups: 25# 4/4/2
-        (date(2025, 8,  3), "weighted_pull_ups"): [
-            (1, 4, 25, ""),
-            (1, 4, 25, ""),
-            (1, 2, 25, ""),
-        ],
-    }
-    replacement_keys = set(replacements.keys())
     new_entries = []
-    for (rep_date, rep_lift), sets_data in replacements.items():
-        existing = [e for e in entries if e.dt == rep_date and e.lift_id == rep_lift]
-        source    = existing[0].source if existing else "manual_correction"
-        raw       = existing[0].raw    if existing else "manual_correction"
-        lift_name = (CURRENT_LIFT_NAMES.get(rep_lift)
-                     or HISTORICAL_LIFT_NAMES.get(rep_lift)
-                     or (existing[0].lift_name if existing else rep_lift))
+    for (rep_date, rep_lift), sets_data in _REPLACEMENTS.items():
+        existing = replaced.get((rep_date, rep_lift))
+        source    = existing.source if existing else "manual_correction"
+        raw       = existing.raw    if existing else "manual_correction"
+        lift_name = (LIFT_NAMES.get(rep_lift)
+                     or (existing.lift_name if existing else rep_lift))
         for s, r, w, note in sets_data:
             new_entries.append(Entry(rep_date, rep_lift, lift_name,
                                      s, r, float(w), note, source, raw))
-    entries = [e for e in entries if (e.dt, e.lift_id) not in replacement_keys]
-    entries.extend(new_entries)
 
     # ----------------------------------------------------------------
-    # 6. Exclude DB rows (row entries < 100 lbs were dumbbell, not machine)
+    # 5. Exclude DB rows (row entries < 100 lbs were dumbbell, not machine)
     # ----------------------------------------------------------------
+    entries = kept + new_entries
     before = len(entries)
     entries = [e for e in entries if not (e.lift_id == "row" and e.weight < 100)]
     excluded = before - len(entries)
@@ -1653,55 +1820,89 @@ PARSERS = {
 }
 
 
-def main():
-    import warnings
-    warnings.filterwarnings("ignore")
+def _load_sheet_rows(sheet_name):
+    """Rows of a dumped sheet, or None if it hasn't been dumped."""
+    json_path = os.path.join(_HERE, f"sheet_{sheet_name}.json")
+    if os.path.exists(json_path + ".gz"):
+        opener, path = gzip.open, json_path + ".gz"
+    elif os.path.exists(json_path):  # uncompressed dump from an older dump_sheets.py
+        opener, path = open, json_path
+    else:
+        return None
+    with opener(path, "rb") as f:
+        return orjson.loads(f.read()) if orjson is not None else json.load(f)
+
 
-    global _strava_dates
-    service = get_service()
+def get_entries():
+    """
+    Parse every dumped sheet, apply corrections, snap to Strava dates and
+    flag suspicious entries. Returns the entries sorted by (date, lift_id).
+    """
+    global _strava_sorted
     all_entries = []
     strava_dates = load_strava_dates()
     if strava_dates:
-        _strava_dates = strava_dates
+        _strava_sorted = sorted(strava_dates)
         print(f"Loaded {len(strava_dates)} Strava strength dates")
 
-    for sheet_name, parser_fn in PARSERS.items():
-        json_path = os.path.join(os.path.dirname(__file__), f"sheet_{sheet_name}.json")
-        if not os.path.exists(json_path):
-            print(f"  Missing {json_path}, skipping")
+    # Read and decompress the dumps concurrently (zlib and file reads drop
+    # the GIL); parse in sheet order on this thread, since the parsers share
+    # resolve_lift's cache and fuzzy-match tally
+    with ThreadPoolExecutor(max_workers=len(PARSERS)) as ex:
+        loaded = list(ex.map(_load_sheet_rows, PARSERS))
+
+    _fuzzy_matches.clear()
+
+    for (sheet_name, parser_fn), rows in zip(PARSERS.items(), loaded):
+        if rows is None:
+            json_path = os.path.join(_HERE, f"sheet_{sheet_name}.json")
+            print(f"  Missing {json_path}.gz, skipping")
             continue
-        with open(json_path) as f:
-            rows = json.load(f)
         entries = parser_fn(rows, sheet_name)
         print(f"  {sheet_name}: {len(entries)} entries parsed")
         all_entries.extend(entries)
 
+    for (label, lift_id), n in sorted(_fuzzy_matches.items()):
+        print(f"  Fuzzy-matched lift {label!r} → {lift_id} ({n} rows)")
+
     print(f"\nTotal entries: {len(all_entries)}")
     all_entries = apply_manual_corrections(all_entries)
     print(f"After corrections/filters: {len(all_entries)} entries")
 
     # Snap estimated dates to nearest Strava workout date (±4 days)
     if strava_dates:
+        snap_table = build_snap_table(strava_dates)
         snapped = 0
         for e in all_entries:
-            new_dt = snap_to_strava(e.dt, strava_dates)
+            new_dt = snap_table.get(e.dt, e.dt)
             if new_dt != e.dt:
                 e.dt = new_dt
                 snapped += 1
         print(f"  Strava snapping: {snapped} entries adjusted")
 
     all_entries = check_reasonableness(all_entries)
+    # Sort once for every consumer (preview, CSV, write_firestore.py)
+    all_entries.sort(key=attrgetter("dt", "lift_id"))
+    return all_entries
+
+
+def main():
+    import warnings
+    warnings.filterwarnings("ignore")
+
+    service = get_service(SCOPES)
+    all_entries = get_entries()
     write_preview(service, all_entries)
 
     # Export to CSV for downstream analysis (e.g. R charts)
-    csv_path = os.path.join(os.path.dirname(__file__), "entries.csv")
+    csv_path = os.path.join(_HERE, "entries.csv")
     with open(csv_path, "w", newline="") as f:
         w = csv.writer(f)
-        w.writerow(["date","lift_id","lift_name","sets","reps","weight","notes","flag","source"])
-        for e in sorted(all_entries, key=lambda x: (x.dt, x.lift_id)):
-            w.writerow([e.dt.strftime("%Y-%m-%d"), e.lift_id, e.lift_name,
-                        e.sets or 0, e.reps or 0, e.weight or 0.0,
-                        e.notes, e.flag, e.source])
+        w.writerow(CSV_COLUMNS)
+        w.writerows([e.dt.isoformat(), e.lift_id, e.lift_name,
+                     e.sets or 0, e.reps or 0, e.weight or 0.0,
+                     e.notes, e.flag, e.source]
+                    for e in all_entries)
     print(f"CSV exported → {csv_path}")
 
 
@@ -2,30 +2,52 @@
 Import parsed lift entries into Firestore.
 
 Usage:
-    python3 write_firestore.py --uid YOUR_FIREBASE_UID [--write]
+    python3 write_firestore.py --uid YOUR_FIREBASE_UID [--write] [--from-sheets]
 
 By default runs in dry-run mode. Pass --write to actually write to Firestore.
+Entries are read from entries.csv; --from-sheets parses the sheet dumps
+directly (as import_preview.py does) and skips the CSV.
 
 To find your UID: open the app in Chrome, open DevTools console, and run:
     firebase.auth().currentUser.uid
 """
 
-import os, sys, json, csv, argparse
-from datetime import datetime, timezone
+import os, sys, json, csv, argparse, functools
+from datetime import datetime, time, timezone
 from google.oauth2.credentials import Credentials
 from google_auth_oauthlib.flow import InstalledAppFlow
 from google.auth.transport.requests import Request
 from google.cloud import firestore
+from google.rpc import code_pb2
+from import_preview import CSV_COLUMNS, get_entries
 
+_HERE = os.path.dirname(os.path.abspath(__file__))
 SCOPES = [
     "https://www.googleapis.com/auth/spreadsheets",
     "https://www.googleapis.com/auth/datastore",
 ]
-CREDS_FILE = os.path.join(os.path.dirname(__file__), "credentials.json")
-TOKEN_FILE  = os.path.join(os.path.dirname(__file__), "token_firestore.json")
-CSV_PATH    = os.path.join(os.path.dirname(__file__), "entries.csv")
+CREDS_FILE = os.path.join(_HERE, "credentials.json")
+TOKEN_FILE  = os.path.join(_HERE, "token_firestore.json")
+CSV_PATH    = os.path.join(_HERE, "entries.csv")
 PROJECT_ID  = "lifts-tracker-2a4ce"
 
+# Positions of the entries.csv columns this script reads
+_DATE    = CSV_COLUMNS.index("date")
+_LIFT_ID = CSV_COLUMNS.index("lift_id")
+_SETS    = CSV_COLUMNS.index("sets")
+_REPS    = CSV_COLUMNS.index("reps")
+_WEIGHT  = CSV_COLUMNS.index("weight")
+_NOTES   = CSV_COLUMNS.index("notes")
+_NOON_UTC = time(12, tzinfo=timezone.utc)
+
+# Transient Firestore errors worth retrying; anything else (e.g.
+# PERMISSION_DENIED from a wrong --uid) fails the write straight away
+_RETRYABLE_CODES = frozenset({
+    code_pb2.ABORTED, code_pb2.UNAVAILABLE, code_pb2.RESOURCE_EXHAUSTED,
+    code_pb2.DEADLINE_EXCEEDED, code_pb2.INTERNAL,
+})
+_MAX_WRITE_ATTEMPTS = 5
+
 
 def get_credentials():
     creds = None
@@ -46,27 +68,47 @@ def load_entries_from_csv():
     if not os.path.exists(CSV_PATH):
         print(f"ERROR: {CSV_PATH} not found. Run import_preview.py first.")
         sys.exit(1)
-    entries = []
-    with open(CSV_PATH) as f:
-        for row in csv.DictReader(f):
-            entries.append(row)
-    return entries
+    with open(CSV_PATH, newline="") as f:
+        reader = csv.reader(f)
+        # Rows are read as plain lists and indexed by position, so insist on
+        # the expected layout rather than silently misreading columns
+        if tuple(next(reader, ())) != CSV_COLUMNS:
+            print(f"ERROR: {CSV_PATH} has unexpected columns. Re-run import_preview.py.")
+            sys.exit(1)
+        return list(reader)
+
+
+@functools.lru_cache(maxsize=None)
+def _noon_utc(date_str):
+    """Noon UTC on an ISO date. Cached: every lift in a session shares its date."""
+    # import_preview.py writes ISO dates, which fromisoformat parses directly
+    return datetime.fromisoformat(date_str).replace(hour=12, tzinfo=timezone.utc)
 
 
 def build_firestore_doc(row):
-    """Convert a CSV row to a Firestore document dict."""
-    dt = datetime.strptime(row["date"], "%Y-%m-%d").replace(
-        hour=12, tzinfo=timezone.utc
-    )
-    sets   = int(row["sets"])   if row["sets"]   else 1
-    reps   = int(row["reps"])   if row["reps"]   else 1
-    weight = float(row["weight"]) if row["weight"] else 0.0
+    """Convert a CSV row (list in CSV_COLUMNS order) to a Firestore document dict."""
+    dt = _noon_utc(row[_DATE])
+    sets   = int(row[_SETS])   if row[_SETS]   else 1
+    reps   = int(row[_REPS])   if row[_REPS]   else 1
+    weight = float(row[_WEIGHT]) if row[_WEIGHT] else 0.0
+    return _firestore_doc(row[_LIFT_ID], dt, sets, reps, weight, row[_NOTES])
 
+
+def entry_to_firestore_doc(e):
+    """Convert an import_preview Entry to a Firestore document dict."""
+    # Same values and types the CSV round-trip would give (it writes None as
+    # 0 and reads weight back as float, even where an Entry holds an int)
+    return _firestore_doc(e.lift_id, datetime.combine(e.dt, _NOON_UTC),
+                          int(e.sets or 0), int(e.reps or 0),
+                          float(e.weight or 0.0), e.notes)
+
+
+def _firestore_doc(lift_id, dt, sets, reps, weight, notes):
     return {
-        "lift":   row["lift_id"],
+        "lift":   lift_id,
         "date":   dt,
         "sets":   [{"sets": sets, "reps": reps, "weight": weight}],
-        "notes":  row["notes"],
+        "notes":  notes,
         # Mark as imported so it can be identified/rolled back if needed
         "_imported": True,
     }
@@ -77,19 +119,26 @@ def main():
     parser.add_argument("--uid",   required=True, help="Your Firebase user UID")
     parser.add_argument("--write", action="store_true",
                         help="Actually write to Firestore (default: dry run)")
+    parser.add_argument("--from-sheets", action="store_true",
+                        help="Parse the sheet dumps directly instead of reading entries.csv")
     args = parser.parse_args()
 
-    entries = load_entries_from_csv()
-    print(f"Loaded {len(entries)} entries from {CSV_PATH}")
+    # Build every document up front so a bad row fails before any writes
+    # (and the dry run checks the whole file, not just the sample)
+    if args.from_sheets:
+        docs = [entry_to_firestore_doc(e) for e in get_entries()]
+        print(f"\nParsed {len(docs)} entries from the sheet dumps")
+    else:
+        docs = [build_firestore_doc(row) for row in load_entries_from_csv()]
+        print(f"Loaded {len(docs)} entries from {CSV_PATH}")
 
     if not args.write:
         print("\n=== DRY RUN — no data written ===")
         print("Sample entries that would be written:")
-        for row in entries[:5]:
-            doc = build_firestore_doc(row)
-            print(f"  {row['date']}  {row['lift_id']:30s}  "
+        for doc in docs[:5]:
+            print(f"  {doc['date']:%Y-%m-%d}  {doc['lift']:30s}  "
                   f"{doc['sets'][0]['sets']}x{doc['sets'][0]['reps']}@{doc['sets'][0]['weight']}")
-        print(f"  ... ({len(entries) - 5} more)")
+        print(f"  ... ({len(docs) - 5} more)")
         print("\nRe-run with --write to import.")
         return
 
@@ -108,20 +157,30 @@ def main():
             print("Aborted.")
             return
 
-    print(f"\nWriting {len(entries)} entries to users/{args.uid}/entries/ ...")
-    written = 0
-    batch = db.batch()
-    for i, row in enumerate(entries):
-        doc_ref = collection.document()
-        batch.set(doc_ref, build_firestore_doc(row))
-        written += 1
-        # Firestore batches are limited to 500 operations
-        if written % 400 == 0:
-            batch.commit()
-            batch = db.batch()
-            print(f"  {written}/{len(entries)} committed...")
-
-    batch.commit()
+    print(f"\nWriting {len(docs)} entries to users/{args.uid}/entries/ ...")
+    # BulkWriter batches and sends writes in parallel (with retries) rather
+    # than waiting on one 400-op batch commit at a time. Its default error
+    # handler retries everything and then drops the write silently, so
+    # record failures here instead.
+    failures = []
+
+    def on_write_error(error, _bw):
+        if error.code in _RETRYABLE_CODES and error.attempts < _MAX_WRITE_ATTEMPTS:
+            return True  # retry
+        failures.append(error)
+        return False
+
+    bw = db.bulk_writer()
+    bw.on_write_error(on_write_error)
+    for doc in docs:
+        bw.set(collection.document(), doc)
+    bw.close()  # flushes and waits for every pending write
+
+    written = len(docs) - len(failures)
+    if failures:
+        print(f"\nERROR: {len(failures)} of {len(docs)} writes failed "
+              f"({written} written). First error: {failures[0].message}")
+        sys.exit(1)
     print(f"\nDone. {written} entries written to Firestore.")
     print("Refresh the app to see your history.")
 